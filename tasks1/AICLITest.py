@@ -1,18 +1,33 @@
+import importlib.util
+
+import httpx
 from openai import OpenAI
-client = OpenAI()
 
-completion = client.chat.completions.create(
+# One client for the whole run so repeated requests reuse the same TLS
+# connection. HTTP/2 needs the optional 'h2' package, so only ask for it
+# when it's installed.
+client = OpenAI(
+  http_client=httpx.Client(
+    http2=importlib.util.find_spec("h2") is not None,
+    limits=httpx.Limits(max_keepalive_connections=10),
+  )
+)
+
+stream = client.chat.completions.create(
   model="gpt-4o-mini",
   messages=[
     {"role": "developer", "content": "You are a helpful assistant."},
     {"role": "user", "content": "why is the sky blue?"}
-  ]
+  ],
+  stream=True
 )
 
-# Extract and format the response nicely
-response = completion.choices[0].message.content
+# Print the response nicely, showing each piece as soon as it arrives
 print("\n" + "="*50)
 print("CHATBOT RESPONSE:")
 print("="*50)
-print(response)
-print("="*50 + "\n")
\ No newline at end of file
+for chunk in stream:
+  if chunk.choices and chunk.choices[0].delta.content:
+    print(chunk.choices[0].delta.content, end="", flush=True)
+print()
+print("="*50 + "\n")
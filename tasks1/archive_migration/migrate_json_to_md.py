@@ -7,6 +7,7 @@ to individual Markdown files in the vault directory.
 
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import storage_markdown
 
@@ -26,8 +27,9 @@ def migrate():
     print()
     
     try:
-        with open(JSON_PATH, "r", encoding="utf-8") as f:
-            tasks = json.load(f)
+        # Parse the raw bytes in one call, without a text stream in between
+        with open(JSON_PATH, "rb") as f:
+            tasks = json.loads(f.read())
     except json.JSONDecodeError:
         print("Error: Could not read tasks.json. File may be corrupted.")
         return
@@ -39,25 +41,37 @@ def migrate():
     print(f"Found {len(tasks)} tasks to migrate...")
     print()
     
+    # Allocate IDs once up front; save_task would otherwise rescan the vault
+    # for every task that has no ID of its own.
+    next_id = max([storage_markdown._next_id()] +
+                  [task["id"] + 1 for task in tasks if task.get("id")])
+    jobs = []
     for task in tasks:
-        title = task.get("title", "Untitled")
-        desc = task.get("description", "")
         tid = task.get("id", None)
-        completed = task.get("completed", False)
-        created_at = task.get("created_at", None)
+        if not tid:
+            tid = next_id
+            next_id += 1
         
-        # Save task as Markdown file
-        saved_id, path = storage_markdown.save_task(
-            title=title,
-            description=desc,
-            task_id=tid,
-            completed=completed,
-            created_at=created_at
-        )
-        
-        status = "✓" if completed else "○"
+        jobs.append({
+            "title": task.get("title", "Untitled"),
+            "description": task.get("description", ""),
+            "task_id": tid,
+            "completed": task.get("completed", False),
+            "created_at": task.get("created_at", None),
+        })
+    
+    # Save tasks as Markdown files; file writes release the GIL, so a thread
+    # pool overlaps them. map() keeps results in input order for the report.
+    workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(
+            lambda job: storage_markdown.save_task(**job), jobs
+        ))
+    
+    for job, (saved_id, path) in zip(jobs, results):
+        status = "✓" if job["completed"] else "○"
         filename = os.path.basename(path)
-        print(f"[{status}] Migrated Task {saved_id}: {title}")
+        print(f"[{status}] Migrated Task {saved_id}: {job['title']}")
         print(f"    → {filename}")
     
     print()
@@ -0,0 +1,458 @@
+"""
+JSON Lines Storage Backend for Task Manager
+
+This module stores every task in one append-only tasks.jsonl file (one JSON
+object per line) plus a binary tasks.idx sidecar mapping each task ID to the
+byte offset of its latest record. It offers the same functions as
+storage_markdown; select it with TASKS_BACKEND=jsonl.
+
+Adding, re-saving or deleting a task appends a record, and for each ID the
+last record wins; a {"id": N, "deleted": true} record removes the task.
+The only in-place edit is flipping "completed" to true, which keeps the
+line the same length.
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import struct
+from collections.abc import Iterator
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers aren't locked against each other
+    fcntl = None
+
+# Data files live next to this module, like the Markdown vault
+DATA_DIR = os.path.dirname(__file__)
+TASKS_PATH = os.path.join(DATA_DIR, "tasks.jsonl")
+INDEX_PATH = os.path.join(DATA_DIR, "tasks.idx")
+
+# One index entry: task ID and byte offset of its record (little-endian u64s)
+_ENTRY = struct.Struct("<QQ")
+
+# Appends go straight to the end of the file without Python-level buffering
+_APPEND_FLAGS = (os.O_WRONLY | os.O_APPEND | os.O_CREAT
+                 | getattr(os, "O_BINARY", 0))
+
+# The same spelling json.dumps produces, so completion can patch it in place
+_NOT_COMPLETED = b'"completed": false'
+_COMPLETED = b'"completed": true '
+
+# Process-level view of the store, valid while tasks.jsonl still has the
+# (mtime_ns, size) in "stamp". "offsets" comes from the index; "tasks" is
+# the fully parsed store, filled in only when something needs every task;
+# "search" pairs each task's search key with its ID, built on first search.
+_STATE = {"stamp": None, "offsets": {}, "max_id": 0, "tasks": None,
+          "search": None}
+
+
+def _search_key(task: dict) -> bytes:
+    """Build the case-folded bytes that search_tasks matches against."""
+    return f"{task['title']}\0{task['description']}".casefold().encode("utf-8")
+
+
+def _stamp() -> tuple:
+    """Return the (mtime_ns, size) of tasks.jsonl, or None if it's missing."""
+    try:
+        st = os.stat(TASKS_PATH)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _rebuild_index() -> dict[int, int]:
+    """Recreate tasks.idx by scanning every record in tasks.jsonl."""
+    offsets = {}
+    entries = bytearray()
+    offset = 0
+    with open(TASKS_PATH, "r+b") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                # Half-written last record from a crash; drop it so the
+                # next append starts on a fresh line
+                f.truncate(offset)
+                break
+            try:
+                tid = json.loads(line)["id"]
+            except (ValueError, KeyError):
+                tid = None
+            if tid is not None:
+                offsets[tid] = offset
+                entries += _ENTRY.pack(tid, offset)
+            offset += len(line)
+    
+    with open(INDEX_PATH, "wb") as f:
+        f.write(entries)
+    return offsets
+
+
+def _read_index(size: int) -> dict[int, int]:
+    """
+    Load the ID -> offset map from tasks.idx.
+    
+    The index is rebuilt if it is missing or doesn't end exactly at the last
+    record in tasks.jsonl (e.g. a crash between the two appends).
+    """
+    try:
+        with open(INDEX_PATH, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        data = b""
+    data = data[:len(data) - len(data) % _ENTRY.size]
+    
+    offsets = {}
+    last = None
+    for tid, offset in _ENTRY.iter_unpack(data):
+        offsets[tid] = offset
+        last = offset
+    
+    if last is None:
+        return _rebuild_index() if size else {}
+    with open(TASKS_PATH, "rb") as f:
+        f.seek(last)
+        if last + len(f.readline()) != size:
+            return _rebuild_index()
+    return offsets
+
+
+def _load_offsets() -> dict[int, int]:
+    """Return the ID -> offset map, reloading it if tasks.jsonl has changed."""
+    stamp = _stamp()
+    if stamp != _STATE["stamp"] or stamp is None:
+        offsets = _read_index(stamp[1]) if stamp else {}
+        _STATE.update(stamp=stamp, offsets=offsets,
+                      max_id=max(offsets, default=0), tasks=None, search=None)
+    return _STATE["offsets"]
+
+
+def _read_records() -> list[dict]:
+    """Parse every record in tasks.jsonl, oldest first."""
+    if not (_STATE["stamp"] and _STATE["stamp"][1]):
+        return []
+    
+    with open(TASKS_PATH, "rb") as f:
+        data = f.read()
+    
+    # Records never contain a raw newline, so the whole file can be
+    # parsed as one JSON array in a single call
+    try:
+        body = data.rstrip(b"\n").replace(b"\n", b",")
+        return json.loads(b"[" + body + b"]")
+    except ValueError:
+        pass
+    
+    # A damaged line somewhere; fall back to parsing line by line
+    records = []
+    for line in data.splitlines():
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue  # torn write; skip it
+    return records
+
+
+def _load_tasks() -> dict[int, dict]:
+    """Return every live task keyed by ID, parsing the store at most once."""
+    _load_offsets()
+    if _STATE["tasks"] is None:
+        tasks = {}
+        for record in _read_records():
+            if record.get("deleted"):
+                tasks.pop(record["id"], None)
+            else:
+                tasks[record["id"]] = record
+        _STATE["tasks"] = tasks
+    return _STATE["tasks"]
+
+
+def _read_record(offset: int) -> dict:
+    """Read the single record that starts at a byte offset."""
+    with open(TASKS_PATH, "rb") as f:
+        f.seek(offset)
+        return json.loads(f.readline())
+
+
+def _lock(fd: int) -> None:
+    """
+    Take an exclusive lock on tasks.jsonl through an open descriptor.
+    
+    The lock lasts until the descriptor is closed. It keeps appends and
+    in-place patches from other processes (a daemon and a local batch, say)
+    from interleaving with this one's.
+    """
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+
+def _append(record: dict) -> None:
+    """Append a record to tasks.jsonl and its offset to tasks.idx."""
+    _append_many([record])
+
+
+def _append_many(records: list[dict]) -> None:
+    """
+    Append records to tasks.jsonl and tasks.idx with one write to each.
+    
+    Records whose "id" is None are numbered here, after the largest ID in
+    use, while the lock is held, so two processes adding tasks at once
+    never hand out the same ID.
+    """
+    fd = os.open(TASKS_PATH, _APPEND_FLAGS, 0o644)
+    try:
+        # Nobody else can write while the lock is held: catch up with what
+        # other processes wrote before it, and the current end of the file
+        # is then where these lines land
+        _lock(fd)
+        _load_offsets()
+        next_id = _STATE["max_id"] + 1
+        for record in records:
+            if record["id"] is None:
+                record["id"] = next_id
+                next_id += 1
+        
+        lines = [
+            json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+            for record in records
+        ]
+        offset = os.lseek(fd, 0, os.SEEK_END)
+        os.write(fd, b"".join(lines))
+        
+        entries = bytearray()
+        for record, line in zip(records, lines):
+            entries += _ENTRY.pack(record["id"], offset)
+            # The state is current, so patch it rather than re-read what
+            # was just written
+            _STATE["offsets"][record["id"]] = offset
+            _STATE["max_id"] = max(_STATE["max_id"], record["id"])
+            if _STATE["tasks"] is not None:
+                if record.get("deleted"):
+                    _STATE["tasks"].pop(record["id"], None)
+                else:
+                    _STATE["tasks"][record["id"]] = record
+            offset += len(line)
+        with open(INDEX_PATH, "ab") as f:
+            f.write(entries)
+        
+        _STATE["search"] = None
+        _STATE["stamp"] = _stamp()
+    finally:
+        os.close(fd)
+
+
+def save_task(title: str, description: str = "", task_id: int = None,
+              completed: bool = False, created_at: str = None) -> tuple:
+    """
+    Save a task by appending it to the JSON Lines store.
+    
+    Args:
+        title: Task title
+        description: Task description (optional)
+        task_id: Task ID (auto-generated if not provided)
+        completed: Completion status
+        created_at: Creation timestamp (auto-generated if not provided)
+    
+    Returns:
+        Tuple of (task_id, file_path)
+    """
+    if created_at is None:
+        created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    
+    record = {
+        "id": task_id or None,  # None: numbered by _append_many
+        "title": title,
+        "description": description,
+        "completed": completed,
+        "created_at": created_at,
+    }
+    _append(record)
+    return record["id"], TASKS_PATH
+
+
+def save_tasks_bulk(pairs) -> list[int]:
+    """
+    Save many tasks with a single append, numbered consecutively.
+    
+    Args:
+        pairs: Iterable of (title, description) tuples
+    
+    Returns:
+        List of the new task IDs, in input order
+    """
+    created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    records = [
+        {
+            "id": None,  # numbered by _append_many
+            "title": title,
+            "description": description,
+            "completed": False,
+            "created_at": created_at,
+        }
+        for title, description in pairs
+    ]
+    if records:
+        _append_many(records)
+    return [record["id"] for record in records]
+
+
+def list_tasks() -> list[dict]:
+    """
+    List all tasks in the store.
+    
+    Returns:
+        List of task dictionaries (shared with the cache; don't modify them)
+    """
+    return list(_load_tasks().values())
+
+
+def get_task(task_id: int) -> dict:
+    """
+    Look up a single task by ID.
+    
+    Args:
+        task_id: ID of the task to fetch
+    
+    Returns:
+        Task dictionary, or None if no task has that ID
+    """
+    offsets = _load_offsets()
+    if _STATE["tasks"] is not None:
+        return _STATE["tasks"].get(task_id)
+    
+    offset = offsets.get(task_id)
+    if offset is None:
+        return None
+    record = _read_record(offset)
+    return None if record.get("deleted") else record
+
+
+def mark_complete(task_id: int) -> bool:
+    """
+    Mark a task as complete.
+    
+    The record is patched in place when it has the usual layout; otherwise
+    an updated copy is appended.
+    
+    Args:
+        task_id: ID of the task to mark complete
+    
+    Returns:
+        True if successful, False if task not found
+    """
+    return bool(mark_complete_bulk([task_id]))
+
+
+def complete_task(task_id: int) -> tuple:
+    """
+    Mark a task as complete unless it is missing or already done.
+    
+    Args:
+        task_id: ID of the task to complete
+    
+    Returns:
+        Tuple of (status, task) where status is "ok", "already" or
+        "missing"; task is the task dictionary, or None if missing
+    """
+    task = get_task(task_id)
+    if task is None:
+        return "missing", None
+    if task["completed"]:
+        return "already", task
+    mark_complete(task_id)
+    return "ok", task
+
+
+def mark_complete_bulk(task_ids) -> list[int]:
+    """
+    Mark many tasks as complete with one open of the store.
+    
+    Records are patched in place where possible; the rest get updated
+    copies appended together at the end.
+    
+    Args:
+        task_ids: Iterable of task IDs (duplicates are ignored)
+    
+    Returns:
+        List of the IDs that were found, in input order
+    """
+    found = []
+    updated = []
+    try:
+        f = open(TASKS_PATH, "r+b")
+    except FileNotFoundError:
+        return found
+    
+    with f:
+        # Load the offsets under the lock, so no other process can append
+        # a newer record for one of these tasks before it is patched
+        _lock(f.fileno())
+        offsets = _load_offsets()
+        for tid in dict.fromkeys(task_ids):
+            offset = offsets.get(tid)
+            if offset is None:
+                continue
+            f.seek(offset)
+            line = f.readline()
+            record = json.loads(line)
+            if record.get("deleted"):
+                continue
+            found.append(tid)
+            if record["completed"]:
+                continue
+            
+            pos = line.find(_NOT_COMPLETED)
+            if pos == -1:
+                updated.append(dict(record, completed=True))
+                continue
+            f.seek(offset + pos)
+            f.write(_COMPLETED)
+            if _STATE["tasks"] is not None:
+                _STATE["tasks"][tid] = dict(record, completed=True)
+        f.flush()
+        _STATE["stamp"] = _stamp()
+    
+    if updated:
+        _append_many(updated)
+    return found
+
+
+def search_tasks(keyword: str) -> Iterator[dict]:
+    """
+    Search tasks by keyword in title or description.
+    
+    Args:
+        keyword: Search keyword
+    
+    Yields:
+        Matching task dictionaries, in store order
+    """
+    needle = keyword.casefold().encode("utf-8")
+    tasks = _load_tasks()
+    if _STATE["search"] is None:
+        # Keyed by ID rather than holding the task, so completing a task
+        # (which replaces its dictionary) doesn't leave a stale copy here
+        _STATE["search"] = [
+            (_search_key(task), tid) for tid, task in tasks.items()
+        ]
+    
+    for key, tid in _STATE["search"]:
+        if key.find(needle) != -1:
+            yield tasks[tid]
+
+
+def delete_task(task_id: int) -> bool:
+    """
+    Delete a task by appending a tombstone record.
+    
+    Args:
+        task_id: ID of the task to delete
+    
+    Returns:
+        True if successful, False if task not found
+    """
+    if get_task(task_id) is None:
+        return False
+    _append({"id": task_id, "deleted": True})
+    return True
@@ -5,15 +5,57 @@ This module provides functions to store tasks as individual Markdown files
 in an Obsidian-style vault with YAML frontmatter.
 """
 
+from __future__ import annotations
+
 import os
+import json
 import re
+import threading
+from collections.abc import Iterator
 from datetime import datetime
-from typing import List, Dict, Any
 
 # Vault directory where Markdown files will be stored
 VAULT_DIR = os.path.join(os.path.dirname(__file__), "vault")
 os.makedirs(VAULT_DIR, exist_ok=True)
 
+# Task files are named "{id}-{slug}.md"
+_ID_RE = re.compile(r'^(\d+)-')
+
+# Index of the vault: task ID -> filename, plus the highest ID in use.
+# Built by one directory scan and kept current by save_task/delete_task, so
+# lookups and ID allocation don't list the vault every time. The vault's
+# mtime is stored with it; a change made by another program (Obsidian,
+# another process) bumps it and triggers a rescan.
+_INDEX = {"mtime": None, "files": {}, "max_id": 0}
+_INDEX_LOCK = threading.Lock()
+
+# Parsed tasks keyed by file path, as (stamp, task, search key) where stamp
+# is the (mtime_ns, size) of the file when it was read and the search key is
+# built once here rather than on every query. list_tasks only re-parses
+# files whose stamp has changed; save_task, mark_complete and delete_task
+# keep it current via _cache_store/_cache_drop.
+_TASK_CACHE = {}
+
+# Layout of a task file: YAML frontmatter followed by the Markdown body.
+# "escaping: json" marks values written with json.dumps; files without it
+# predate that and stored backslashes as-is, so they mustn't be decoded.
+_TASK_TEMPLATE = (
+    "---\n"
+    "id: {tid}\n"
+    "title: {title}\n"
+    "description: {description}\n"
+    "completed: {completed}\n"
+    "created_at: {created_at}\n"
+    "escaping: json\n"
+    "---\n"
+    "\n"
+    "# {heading}\n"
+    "{body}"
+)
+
+# Bytes read from the start of a task file when patching its frontmatter
+_HEAD_SIZE = 4096
+
 
 def _slugify(s: str) -> str:
     """Convert a string to a URL-friendly slug."""
@@ -22,17 +64,73 @@ def _slugify(s: str) -> str:
     return s or 'task'
 
 
+def _unquote(value: str, escaped: bool) -> str:
+    """
+    Decode a frontmatter value, undoing the escaping done by save_task.
+    
+    Args:
+        value: Raw value as it appears after the key
+        escaped: True if the file is marked "escaping: json"; older files
+            only escaped double quotes, so "D:\\notes" stays as written
+    """
+    if len(value) >= 2 and value[0] == '"' and value[-1] == '"':
+        if not escaped:
+            return value[1:-1].replace('\\"', '"')
+        # Only escaped values need the JSON parser; most are plain text
+        if '\\' not in value:
+            return value[1:-1]
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return value.strip('"')
+
+
+def _search_key(task: dict) -> bytes:
+    """
+    Build the case-folded bytes that search_tasks matches against.
+    
+    Title and description are folded and encoded together so each task
+    costs a single bytes.find; the NUL separator keeps a keyword from
+    matching across the two fields.
+    """
+    return f"{task['title']}\0{task['description']}".casefold().encode("utf-8")
+
+
+def _vault_index() -> dict[int, str]:
+    """Return the task ID -> filename map, rescanning if the vault changed."""
+    mtime = os.stat(VAULT_DIR).st_mtime_ns
+    with _INDEX_LOCK:
+        if mtime != _INDEX["mtime"]:
+            files = {}
+            max_id = 0
+            with os.scandir(VAULT_DIR) as entries:
+                for entry in entries:
+                    m = _ID_RE.match(entry.name)
+                    if m:
+                        tid = int(m.group(1))
+                        max_id = max(max_id, tid)
+                        if entry.name.endswith('.md'):
+                            files[tid] = entry.name
+            _INDEX.update(mtime=mtime, files=files, max_id=max_id)
+        return _INDEX["files"]
+
+
+def _index_update(tid: int, filename: str = None) -> None:
+    """Record a file this module just wrote (or removed, if no filename)."""
+    with _INDEX_LOCK:
+        if filename is None:
+            _INDEX["files"].pop(tid, None)
+        else:
+            _INDEX["files"][tid] = filename
+            _INDEX["max_id"] = max(_INDEX["max_id"], tid)
+        _INDEX["mtime"] = os.stat(VAULT_DIR).st_mtime_ns
+
+
 def _next_id() -> int:
-    """Find the next available task ID by scanning existing files."""
-    max_id = 0
-    for name in os.listdir(VAULT_DIR):
-        m = re.match(r'^(\d+)-', name)
-        if m:
-            try:
-                max_id = max(max_id, int(m.group(1)))
-            except ValueError:
-                pass
-    return max_id + 1
+    """Find the next available task ID."""
+    _vault_index()
+    return _INDEX["max_id"] + 1
 
 
 def save_task(title: str, description: str = "", task_id: int = None, 
@@ -50,7 +148,9 @@ def save_task(title: str, description: str = "", task_id: int = None,
     Returns:
         Tuple of (task_id, file_path)
     """
-    tid = task_id if task_id else _next_id()
+    # Bring the index up to date before this write changes the vault's mtime
+    _vault_index()
+    tid = task_id if task_id else _INDEX["max_id"] + 1
     slug = _slugify(title)
     filename = f"{tid}-{slug}.md"
     path = os.path.join(VAULT_DIR, filename)
@@ -58,70 +158,239 @@ def save_task(title: str, description: str = "", task_id: int = None,
     if created_at is None:
         created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
-    # YAML frontmatter (Obsidian-friendly)
-    completed_str = "true" if completed else "false"
-    front = [
-        "---",
-        f"id: {tid}",
-        f"title: \"{title.replace('\"', '\\\"')}\"",
-        f"description: \"{description.replace('\"', '\\\"')}\"",
-        f"completed: {completed_str}",
-        f"created_at: \"{created_at}\"",
-        "---",
-        "",
+    # YAML frontmatter (Obsidian-friendly). json.dumps escapes quotes,
+    # backslashes and newlines in one C call and yields a valid YAML
+    # double-quoted scalar.
+    content = _TASK_TEMPLATE.format(
+        tid=tid,
+        title=json.dumps(title, ensure_ascii=False),
+        description=json.dumps(description, ensure_ascii=False),
+        completed="true" if completed else "false",
+        created_at=json.dumps(created_at, ensure_ascii=False),
+        heading=title,
+        body=f"\n{description}\n" if description else "",
+    )
+    
+    with open(path, "wb") as f:
+        f.write(content.encode("utf-8"))
+    
+    _index_update(tid, filename)
+    _cache_store(path, {
+        "id": tid,
+        "title": title,
+        "description": description,
+        "completed": completed,
+        "created_at": created_at,
+        "file": path
+    })
+    return tid, path
+
+
+def save_tasks_bulk(pairs) -> list[int]:
+    """
+    Save many tasks in one go, numbered consecutively.
+    
+    Args:
+        pairs: Iterable of (title, description) tuples
+    
+    Returns:
+        List of the new task IDs, in input order
+    """
+    # One timestamp for the batch; the vault index stays warm throughout
+    created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return [
+        save_task(title, description, created_at=created_at)[0]
+        for title, description in pairs
     ]
+
+
+def _read_task(path: str) -> dict:
+    """Parse one task file into a task dictionary."""
+    # Parse YAML frontmatter, stopping at the closing "---" so the
+    # Markdown body is never read
+    meta = {}
+    with open(path, "r", encoding="utf-8") as f:
+        if f.readline().strip() == "---":
+            for line in f:
+                line = line.strip()
+                if line == "---":
+                    break
+                if ':' in line:
+                    k, v = line.split(':', 1)
+                    meta[k.strip()] = v.strip()
     
-    # Markdown body
-    body = [f"# {title}", ""]
-    if description:
-        body.extend([description, ""])
+    # Decode once the whole frontmatter (and so the marker) has been seen
+    escaped = meta.get("escaping") == "json"
+    meta = {k: _unquote(v, escaped) for k, v in meta.items()}
     
-    content = "\n".join(front + body)
+    # Ensure minimal fields
+    return {
+        "id": int(meta.get("id", 0)),
+        "title": meta.get("title", ""),
+        "description": meta.get("description", ""),
+        "completed": meta.get("completed", "false").lower() == "true",
+        "created_at": meta.get("created_at", ""),
+        "file": path
+    }
+
+
+def _stamp(path: str) -> tuple:
+    """Return the (mtime_ns, size) pair the parse cache is keyed on."""
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _cache_store(path: str, task: dict, stamp: tuple = None) -> None:
+    """Put a parsed task in the cache, stamping it now if no stamp is given."""
+    _TASK_CACHE[path] = (stamp or _stamp(path), task, _search_key(task))
+
+
+def _cache_drop(path: str) -> None:
+    """Forget a task file that no longer exists."""
+    _TASK_CACHE.pop(path, None)
+
+
+def _cached_entries() -> list[tuple]:
+    """
+    Bring the parse cache up to date with the vault.
     
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(content)
+    Returns:
+        Cache entries (stamp, task, search key) in filename order
+    """
+    with os.scandir(VAULT_DIR) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
     
-    return tid, path
+    cached_entries = []
+    seen = set()
+    for entry in entries:
+        if not entry.name.endswith('.md') or not entry.is_file():
+            continue
+        
+        st = entry.stat()
+        stamp = st.st_mtime_ns, st.st_size
+        cached = _TASK_CACHE.get(entry.path)
+        if cached is None or cached[0] != stamp:
+            _cache_store(entry.path, _read_task(entry.path), stamp)
+            cached = _TASK_CACHE[entry.path]
+        cached_entries.append(cached)
+        seen.add(entry.path)
+    
+    # Drop files that have disappeared from the vault
+    for path in _TASK_CACHE.keys() - seen:
+        _cache_drop(path)
+    
+    return cached_entries
 
 
-def list_tasks() -> List[Dict[str, Any]]:
+def list_tasks() -> list[dict]:
     """
     List all tasks by reading Markdown files from the vault.
     
+    Files that haven't changed since the last call are served from the
+    in-process cache instead of being parsed again.
+    
     Returns:
-        List of task dictionaries
+        List of task dictionaries (shared with the cache; don't modify them)
+    """
+    return [cached[1] for cached in _cached_entries()]
+
+
+def get_task(task_id: int) -> dict:
     """
-    tasks = []
-    for name in sorted(os.listdir(VAULT_DIR)):
-        path = os.path.join(VAULT_DIR, name)
-        if not os.path.isfile(path) or not name.endswith('.md'):
+    Look up a single task by ID.
+    
+    Args:
+        task_id: ID of the task to fetch
+    
+    Returns:
+        Task dictionary, or None if no task has that ID
+    """
+    name = _vault_index().get(task_id)
+    if name is None:
+        return None
+    
+    path = os.path.join(VAULT_DIR, name)
+    try:
+        stamp = _stamp(path)
+    except OSError:
+        return None
+    
+    cached = _TASK_CACHE.get(path)
+    if cached is None or cached[0] != stamp:
+        _cache_store(path, _read_task(path), stamp)
+        cached = _TASK_CACHE[path]
+    return cached[1]
+
+
+def _complete_in_place(path: str) -> bool:
+    """
+    Set "completed: true" by overwriting only that value in the file.
+    
+    Just the first few KB are read to find the field; the new value is
+    padded with spaces to the old length so nothing after it moves.
+    
+    Returns:
+        True if the file was patched, False if the caller should fall back
+        to rewriting the whole file
+    """
+    with open(path, "r+b") as f:
+        head = f.read(_HEAD_SIZE)
+        if not head.startswith(b"---"):
+            return False
+        end = head.find(b"\n---", 3)
+        if end == -1:
+            return False
+        start = head.find(b"\ncompleted:", 0, end)
+        if start == -1:
+            return False
+        value_start = start + len(b"\ncompleted:")
+        value_end = head.find(b"\n", value_start)
+        old = head[value_start:value_end].rstrip(b"\r")
+        if len(old) < len(b" true"):
+            return False
+        f.seek(value_start)
+        f.write(b" true".ljust(len(old)))
+    return True
+
+
+def _rewrite_completed(path: str) -> None:
+    """Set "completed: true" by rewriting the whole task file."""
+    with open(path, "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    
+    # Update the completed field in frontmatter
+    out = []
+    in_front = False
+    for i, line in enumerate(lines):
+        if i == 0 and line.strip() == "---":
+            in_front = True
+            out.append(line)
             continue
-        
-        with open(path, "r", encoding="utf-8") as f:
-            lines = f.read().splitlines()
-        
-        # Parse YAML frontmatter
-        meta = {}
-        if lines and lines[0].strip() == "---":
-            i = 1
-            while i < len(lines) and lines[i].strip() != "---":
-                line = lines[i].strip()
-                if ':' in line:
-                    k, v = line.split(':', 1)
-                    meta[k.strip()] = v.strip().strip('"')
-                i += 1
-        
-        # Ensure minimal fields
-        tasks.append({
-            "id": int(meta.get("id", 0)),
-            "title": meta.get("title", ""),
-            "description": meta.get("description", ""),
-            "completed": meta.get("completed", "false").lower() == "true",
-            "created_at": meta.get("created_at", ""),
-            "file": path
-        })
+        if in_front and line.strip().startswith("completed:"):
+            out.append("completed: true")
+            continue
+        if in_front and line.strip() == "---":
+            in_front = False
+            out.append(line)
+            continue
+        out.append(line)
     
-    return tasks
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(out))
+
+
+def _complete_file(path: str) -> None:
+    """Set "completed: true" in one task file and in its cached copy."""
+    cached = _TASK_CACHE.get(path)
+    if cached is not None and cached[0] != _stamp(path):
+        cached = None
+    
+    if not _complete_in_place(path):
+        _rewrite_completed(path)
+    
+    # Keep the cached copy current rather than re-parsing the file
+    if cached is not None:
+        _cache_store(path, dict(cached[1], completed=True))
 
 
 def mark_complete(task_id: int) -> bool:
@@ -134,56 +403,75 @@ def mark_complete(task_id: int) -> bool:
     Returns:
         True if successful, False if task not found
     """
-    for name in os.listdir(VAULT_DIR):
-        if name.startswith(f"{task_id}-"):
-            path = os.path.join(VAULT_DIR, name)
-            
-            with open(path, "r", encoding="utf-8") as f:
-                lines = f.read().splitlines()
-            
-            # Update the completed field in frontmatter
-            out = []
-            in_front = False
-            for i, line in enumerate(lines):
-                if i == 0 and line.strip() == "---":
-                    in_front = True
-                    out.append(line)
-                    continue
-                if in_front and line.strip().startswith("completed:"):
-                    out.append("completed: true")
-                    continue
-                if in_front and line.strip() == "---":
-                    in_front = False
-                    out.append(line)
-                    continue
-                out.append(line)
-            
-            with open(path, "w", encoding="utf-8") as f:
-                f.write("\n".join(out))
-            
-            return True
-    
-    return False
-
-
-def search_tasks(keyword: str) -> List[Dict[str, Any]]:
+    name = _vault_index().get(task_id)
+    if name is None:
+        return False
+    
+    _complete_file(os.path.join(VAULT_DIR, name))
+    return True
+
+
+def complete_task(task_id: int) -> tuple:
     """
-    Search tasks by keyword in title or description.
+    Mark a task as complete unless it is missing or already done.
     
     Args:
-        keyword: Search keyword
+        task_id: ID of the task to complete
     
     Returns:
-        List of matching task dictionaries
+        Tuple of (status, task) where status is "ok", "already" or
+        "missing"; task is the task dictionary, or None if missing
     """
-    all_tasks = list_tasks()
-    keyword_lower = keyword.lower()
+    task = get_task(task_id)
+    if task is None:
+        return "missing", None
+    if task['completed']:
+        return "already", task
+    if not mark_complete(task_id):
+        return "missing", None
+    return "ok", task
+
+
+def mark_complete_bulk(task_ids) -> list[int]:
+    """
+    Mark many tasks as complete, looking them all up in one vault index.
     
-    return [
-        task for task in all_tasks
-        if keyword_lower in task['title'].lower() or 
-           keyword_lower in task['description'].lower()
-    ]
+    Completing a task only rewrites its own file, which leaves the vault
+    directory (and so the index) unchanged, so one snapshot serves the
+    whole batch.
+    
+    Args:
+        task_ids: Iterable of task IDs (duplicates are ignored)
+    
+    Returns:
+        List of the IDs that were found, in input order
+    """
+    files = _vault_index()
+    found = []
+    for tid in dict.fromkeys(task_ids):
+        name = files.get(tid)
+        if name is not None:
+            _complete_file(os.path.join(VAULT_DIR, name))
+            found.append(tid)
+    return found
+
+
+def search_tasks(keyword: str) -> Iterator[dict]:
+    """
+    Search tasks by keyword in title or description.
+    
+    Each cached task's search key is checked with one bytes.find.
+    
+    Args:
+        keyword: Search keyword
+    
+    Yields:
+        Matching task dictionaries, in vault order
+    """
+    needle = keyword.casefold().encode("utf-8")
+    for stamp, task, key in _cached_entries():
+        if key.find(needle) != -1:
+            yield task
 
 
 def delete_task(task_id: int) -> bool:
@@ -196,13 +484,16 @@ def delete_task(task_id: int) -> bool:
     Returns:
         True if successful, False if task not found
     """
-    for name in os.listdir(VAULT_DIR):
-        if name.startswith(f"{task_id}-"):
-            path = os.path.join(VAULT_DIR, name)
-            try:
-                os.remove(path)
-                return True
-            except OSError:
-                return False
+    name = _vault_index().get(task_id)
+    if name is None:
+        return False
+    
+    path = os.path.join(VAULT_DIR, name)
+    try:
+        os.remove(path)
+    except OSError:
+        return False
     
-    return False
+    _index_update(task_id)
+    _cache_drop(path)
+    return True
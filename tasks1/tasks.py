@@ -14,16 +14,101 @@ Usage:
     python tasks.py list
     python tasks.py search "keyword"
     python tasks.py complete <task_id>
+    python tasks.py batch <file>
+    python tasks.py daemon
 """
 
+from __future__ import annotations
+
+import os
 import sys
-from typing import List, Dict, Any, Optional
-import storage_markdown
+
+# Output templates, built once at import as bytes for %-formatting
+_BANNER = b"=" * 60
+_LIST_HEADER = b"\n" + _BANNER + b"\nTASKS (%d total)\n" + _BANNER + b"\n\n"
+_SEARCH_HEADER = (
+    b"\n" + _BANNER + b"\nSEARCH RESULTS for '%s'\n" + _BANNER + b"\n\n"
+)
+_SEARCH_TRAILER = b"(%d found)\n"
+
+# Commands a running daemon can answer; anything else always runs locally
+_DAEMON_COMMANDS = {"add", "list", "search", "complete", "delete"}
+
+# Seconds a client waits for the daemon to accept it and say it is ready.
+# Nothing has been sent by then, so on timeout the command runs locally.
+_DAEMON_CONNECT_TIMEOUT = 1.0
+
+# Seconds a client waits for each part of the reply once its request is sent
+_DAEMON_REPLY_TIMEOUT = 30.0
+
+# Seconds the daemon gives a client to send its request, so one idle
+# connection can't hold up everyone else. The reply has no limit: a client
+# piping into a pager may take as long as it likes to read it.
+_DAEMON_REQUEST_TIMEOUT = 5.0
+
+# Streamed output is written whenever this many bytes have built up
+_FLUSH_SIZE = 64 * 1024
+
+# Status glyphs indexed by task['completed'] (False -> 0, True -> 1),
+# already encoded so they can go straight into the byte templates
+_STATUS = ("○".encode("utf-8"), "✓".encode("utf-8"))
+_TASK_TMPL = (
+    b"[%s] ID: %d\n"
+    b"    Title: %s\n"
+    b"    Created: %s\n\n"
+)
+_TASK_DESC_TMPL = (
+    b"[%s] ID: %d\n"
+    b"    Title: %s\n"
+    b"    Description: %s\n"
+    b"    Created: %s\n\n"
+)
+
+
+def _backend() -> str:
+    """Return the storage backend name chosen by TASKS_BACKEND."""
+    if os.environ.get("TASKS_BACKEND", "").lower() == "jsonl":
+        return "jsonl"
+    return "markdown"
+
+
+def _storage():
+    """Import and return the selected storage backend module."""
+    if _backend() == "jsonl":
+        import storage_jsonl as storage
+    else:
+        import storage_markdown as storage
+    return storage
+
+
+def _format_task(task: dict) -> bytes:
+    """Format one task as a UTF-8 block of lines for list/search output."""
+    status = _STATUS[task['completed']]
+    title = task['title'].encode("utf-8")
+    created_at = task['created_at'].encode("utf-8")
+    if task['description']:
+        description = task['description'].encode("utf-8")
+        return _TASK_DESC_TMPL % (status, task['id'], title, description,
+                                  created_at)
+    return _TASK_TMPL % (status, task['id'], title, created_at)
+
+
+def _write_output(buf: bytearray) -> None:
+    """Write pre-encoded output to the binary stdout in a single call."""
+    sys.stdout.flush()  # keep anything already printed ahead of this
+    out = getattr(sys.stdout, "buffer", None)
+    if out is None:
+        sys.stdout.write(buf.decode("utf-8"))
+        return
+    out.write(buf)
+    out.flush()
 
 
 def add_task(title: str, description: str = "") -> None:
     """Add a new task."""
-    task_id, file_path = storage_markdown.save_task(title, description)
+    storage = _storage()
+    
+    task_id, file_path = storage.save_task(title, description)
     
     print(f"✓ Task added successfully (ID: {task_id})")
     print(f"  Title: {title}")
@@ -31,96 +116,150 @@ def add_task(title: str, description: str = "") -> None:
 
 def list_tasks() -> None:
     """List all tasks."""
-    tasks = storage_markdown.list_tasks()
+    storage = _storage()
+    
+    tasks = storage.list_tasks()
     
     if not tasks:
         print("No tasks found.")
         return
     
-    print(f"\n{'='*60}")
-    print(f"TASKS ({len(tasks)} total)")
-    print(f"{'='*60}\n")
-    
+    buf = bytearray(_LIST_HEADER % len(tasks))
     for task in tasks:
-        status = "✓" if task['completed'] else "○"
-        print(f"[{status}] ID: {task['id']}")
-        print(f"    Title: {task['title']}")
-        if task['description']:
-            print(f"    Description: {task['description']}")
-        print(f"    Created: {task['created_at']}")
-        print()
+        buf += _format_task(task)
+    
+    _write_output(buf)
 
 
 def search_tasks(keyword: str) -> None:
     """Search tasks by keyword in title or description."""
-    matching_tasks = storage_markdown.search_tasks(keyword)
+    storage = _storage()
     
-    if not matching_tasks:
+    # Results are streamed, so the count comes after them in a trailer
+    matches = storage.search_tasks(keyword)
+    first = next(matches, None)
+    
+    if first is None:
         print(f"No tasks found matching '{keyword}'")
         return
     
-    print(f"\n{'='*60}")
-    print(f"SEARCH RESULTS for '{keyword}' ({len(matching_tasks)} found)")
-    print(f"{'='*60}\n")
+    buf = bytearray(_SEARCH_HEADER % keyword.encode("utf-8"))
+    buf += _format_task(first)
+    found = 1
+    for task in matches:
+        buf += _format_task(task)
+        found += 1
+        if len(buf) >= _FLUSH_SIZE:
+            _write_output(buf)
+            buf.clear()
     
-    for task in matching_tasks:
-        status = "✓" if task['completed'] else "○"
-        print(f"[{status}] ID: {task['id']}")
-        print(f"    Title: {task['title']}")
-        if task['description']:
-            print(f"    Description: {task['description']}")
-        print(f"    Created: {task['created_at']}")
-        print()
+    buf += _SEARCH_TRAILER % found
+    _write_output(buf)
 
 
 def complete_task(task_id: int) -> None:
     """Mark a task as complete."""
-    # First check if task exists and if it's already completed
-    tasks = storage_markdown.list_tasks()
-    task_found = None
+    storage = _storage()
     
-    for task in tasks:
-        if task['id'] == task_id:
-            task_found = task
-            break
+    # Existence check, status check and update happen in one storage call
+    status, task = storage.complete_task(task_id)
     
-    if not task_found:
+    if status == "missing":
         print(f"Error: Task {task_id} not found.")
-        return
-    
-    if task_found['completed']:
+    elif status == "already":
         print(f"Task {task_id} is already completed.")
-        return
-    
-    # Mark task as complete
-    if storage_markdown.mark_complete(task_id):
-        print(f"✓ Task {task_id} marked as complete: {task_found['title']}")
     else:
-        print(f"Error: Could not mark task {task_id} as complete.")
+        print(f"✓ Task {task_id} marked as complete: {task['title']}")
 
 
 def delete_task(task_id: int) -> None:
     """Delete a task by ID."""
-    # First check if task exists
-    tasks = storage_markdown.list_tasks()
-    task_found = None
+    storage = _storage()
     
-    for task in tasks:
-        if task['id'] == task_id:
-            task_found = task
-            break
+    # First check if task exists
+    task_found = storage.get_task(task_id)
     
     if not task_found:
         print(f"Error: Task {task_id} not found.")
         return
     
     # Delete the task
-    if storage_markdown.delete_task(task_id):
+    if storage.delete_task(task_id):
         print(f"✓ Task {task_id} deleted: {task_found['title']}")
     else:
         print(f"Error: Could not delete task {task_id}.")
 
 
+def _read_lines(path: str) -> list[str]:
+    """Return the lines of a batch file, or print an error and exit."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read().splitlines()
+    except OSError as e:
+        print(f"Error: Could not read {path}: {e.strerror}")
+        sys.exit(1)
+    except UnicodeDecodeError:
+        print(f"Error: Could not read {path}: not UTF-8 text")
+        sys.exit(1)
+
+
+def batch_tasks(path: str) -> None:
+    """
+    Add every task listed in a file with one storage call.
+    
+    Each non-blank line is either "title<TAB>description" or a JSON object
+    with "title" and optional "description". The whole file is checked
+    before anything is saved.
+    """
+    import json
+    
+    pairs = []
+    for lineno, line in enumerate(_read_lines(path), 1):
+        if not line.strip():
+            continue
+        if line.lstrip().startswith("{"):
+            try:
+                item = json.loads(line)
+                title = item["title"]
+                description = item.get("description", "")
+            except (ValueError, KeyError):
+                title = None
+        else:
+            title, _, description = line.partition("\t")
+        if not (isinstance(title, str) and isinstance(description, str)
+                and title.strip()):
+            print(f"Error: {path} line {lineno}: task title required.")
+            sys.exit(1)
+        pairs.append((title, description))
+    
+    if not pairs:
+        print("No tasks to add.")
+        return
+    
+    task_ids = _storage().save_tasks_bulk(pairs)
+    first, last = task_ids[0], task_ids[-1]
+    print(f"✓ {len(task_ids)} tasks added (IDs {first}-{last})")
+
+
+def batch_complete(path: str) -> None:
+    """Mark every task whose ID is listed in a file as complete."""
+    task_ids = []
+    for word in " ".join(_read_lines(path)).split():
+        if not _is_task_id(word):
+            print(f"Error: {path}: '{word}' is not a task ID.")
+            sys.exit(1)
+        task_ids.append(int(word))
+    
+    found = set(_storage().mark_complete_bulk(task_ids))
+    print(f"✓ {len(found)} tasks marked as complete")
+    
+    missing = [tid for tid in dict.fromkeys(task_ids) if tid not in found]
+    for tid in missing:
+        print(f"Error: Task {tid} not found.")
+    if missing:
+        sys.exit(1)
+
+
 def show_help() -> None:
     """Display help information."""
     help_text = """
@@ -135,6 +274,12 @@ COMMANDS:
     search <keyword>             Search tasks by keyword
     complete <task_id>           Mark a task as complete
     delete <task_id>             Delete a task
+    batch <file>                 Add one task per line of a file
+                                 ("title<TAB>description" or JSON)
+    batch-complete <file>        Mark complete every task ID in a file
+    daemon                       Keep tasks loaded in a background server
+                                 (Unix only); other commands use it while
+                                 it is running
     help                         Show this help message
 
 EXAMPLES:
@@ -143,73 +288,339 @@ EXAMPLES:
     python tasks.py search "groceries"
     python tasks.py complete 1
     python tasks.py delete 1
+    python tasks.py batch new_tasks.tsv
 """
     print(help_text)
 
 
-def main():
-    """Main entry point for the application."""
-    if len(sys.argv) < 2:
-        show_help()
-        return
+def _socket_path() -> str:
+    """Return the Unix socket path the daemon for this vault listens on."""
+    import zlib
     
-    command = sys.argv[1].lower()
+    # One socket per checkout and backend, so a daemon only ever answers
+    # for the same data the client would have used
+    here = os.path.dirname(os.path.abspath(__file__))
+    key = zlib.crc32(f"{here}:{_backend()}".encode())
+    # XDG_RUNTIME_DIR is private to the user; without it, use a per-user
+    # directory in /tmp, which run_daemon creates with mode 0700
+    runtime_dir = (os.environ.get("XDG_RUNTIME_DIR")
+                   or f"/tmp/tasks-{os.getuid()}")
+    return os.path.join(runtime_dir, f"tasks-{key:08x}.sock")
+
+
+def _dispatch(argv: list[str]) -> int:
+    """Run one command in this process and return its exit status."""
+    try:
+        _COMMANDS.get(_command_name(argv), _cmd_unknown)(argv)
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        return e.code if isinstance(e.code, int) else 1
+    return 0
+
+
+def _run_via_daemon(argv: list[str]) -> bool:
+    """
+    Send a command to the running daemon and print its reply.
     
-    if command == "add":
-        if len(sys.argv) < 3:
-            print("Error: Task title required.")
-            print("Usage: python tasks.py add <title> [description]")
-            sys.exit(1)
-        
-        title = sys.argv[2]
-        description = sys.argv[3] if len(sys.argv) > 3 else ""
-        add_task(title, description)
+    Returns:
+        True if the daemon handled the command, False if none is running
+        (or it didn't answer in time, before anything was sent to it)
+    """
+    if not hasattr(os, "getuid"):
+        return False
     
-    elif command == "list":
-        list_tasks()
+    # Only talk to a socket created by this user: the request carries the
+    # task text, and the reply is printed and trusted as-is. Checking the
+    # file first also spares the common no-daemon case the socket import.
+    path = _socket_path()
+    try:
+        if os.stat(path).st_uid != os.getuid():
+            return False
+    except OSError:
+        return False
     
-    elif command == "search":
-        if len(sys.argv) < 3:
-            print("Error: Search keyword required.")
-            print("Usage: python tasks.py search <keyword>")
-            sys.exit(1)
-        
-        keyword = sys.argv[2]
-        search_tasks(keyword)
+    import json
+    import socket
     
-    elif command == "complete":
-        if len(sys.argv) < 3:
-            print("Error: Task ID required.")
-            print("Usage: python tasks.py complete <task_id>")
-            sys.exit(1)
-        
+    if not hasattr(socket, "AF_UNIX"):
+        return False
+    
+    # Wait for the daemon's ready line before sending anything, so a stuck
+    # or suspended daemon never receives a command this process then runs
+    # again locally
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(_DAEMON_CONNECT_TIMEOUT)
+    try:
+        sock.connect(path)
+        reply = sock.makefile("rb")
+        ready = reply.readline()
+    except OSError:
+        ready = b""
+    if ready != b"ready\n":
+        sock.close()
+        return False
+    
+    # Request: one JSON line. Reply: a line with the exit status and the
+    # output's length in bytes, then the output.
+    header = []
+    received = 0
+    with sock, reply:
+        sock.settimeout(_DAEMON_REPLY_TIMEOUT)
         try:
-            task_id = int(sys.argv[2])
-            complete_task(task_id)
-        except ValueError:
-            print("Error: Task ID must be a number.")
-            sys.exit(1)
+            sock.sendall(json.dumps({"argv": argv}).encode("utf-8") + b"\n")
+            header = reply.readline().split()
+            sys.stdout.flush()
+            for chunk in iter(lambda: reply.read(65536), b""):
+                sys.stdout.buffer.write(chunk)
+                received += len(chunk)
+        except OSError:
+            pass
+    sys.stdout.flush()
     
-    elif command == "delete":
-        if len(sys.argv) < 3:
-            print("Error: Task ID required.")
-            print("Usage: python tasks.py delete <task_id>")
-            sys.exit(1)
+    if len(header) != 2:
+        print("Error: task daemon did not reply.")
+        sys.exit(1)
+    status, length = map(int, header)
+    if received != length:
+        print(f"\nError: task daemon reply was cut short "
+              f"({received} of {length} bytes).")
+        sys.exit(1)
+    if status:
+        sys.exit(status)
+    return True
+
+
+def run_daemon() -> None:
+    """Serve commands over a Unix socket, keeping the task cache warm."""
+    import contextlib
+    import io
+    import json
+    import signal
+    import socket
+    import socketserver
+    import threading
+    import traceback
+    
+    if not (hasattr(socket, "AF_UNIX") and hasattr(os, "getuid")):
+        print("Error: daemon mode needs Unix domain sockets.")
+        sys.exit(1)
+    
+    path = _socket_path()
+    runtime_dir = os.path.dirname(path)
+    os.makedirs(runtime_dir, mode=0o700, exist_ok=True)
+    st = os.stat(runtime_dir)
+    if st.st_uid != os.getuid() or st.st_mode & 0o077:
+        print(f"Error: {runtime_dir} must be a directory only you can access.")
+        sys.exit(1)
+    
+    if os.path.exists(path):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(path)
+            except OSError:
+                os.remove(path)  # left behind by a daemon that died
+            else:
+                print(f"Error: a task daemon is already running on {path}")
+                sys.exit(1)
+    
+    # Held while a command runs, so stopping waits for it to finish
+    busy = threading.Lock()
+    
+    class Handler(socketserver.StreamRequestHandler):
+        # Socket timeout for this connection; see _DAEMON_REQUEST_TIMEOUT
+        timeout = _DAEMON_REQUEST_TIMEOUT
         
-        try:
-            task_id = int(sys.argv[2])
-            delete_task(task_id)
-        except ValueError:
-            print("Error: Task ID must be a number.")
-            sys.exit(1)
+        def handle(self):
+            try:
+                self.wfile.write(b"ready\n")
+                line = self.rfile.readline()
+            except OSError:
+                return  # client timed out or left before sending a request
+            if not line:
+                return  # a bare connect, e.g. the already-running probe
+            self.connection.settimeout(None)  # see _DAEMON_REQUEST_TIMEOUT
+            argv = json.loads(line)["argv"]
+            # A text stream with a binary buffer underneath, like the real
+            # stdout; write_through keeps print() and buffer writes in order
+            out = io.TextIOWrapper(io.BytesIO(), encoding="utf-8",
+                                   write_through=True)
+            with busy, contextlib.redirect_stdout(out):
+                try:
+                    status = _dispatch(argv)
+                except Exception:
+                    traceback.print_exc(file=out)
+                    status = 1
+            output = out.buffer.getvalue()
+            try:
+                self.wfile.write(f"{status} {len(output)}\n".encode("utf-8"))
+                self.wfile.write(output)
+            except OSError:
+                pass  # client left; it reports the short reply itself
     
-    elif command == "help":
-        show_help()
+    # Only the current user may connect: the socket grants full task access
+    old_umask = os.umask(0o177)
+    try:
+        server = socketserver.UnixStreamServer(path, Handler)
+    finally:
+        os.umask(old_umask)
     
-    else:
-        print(f"Error: Unknown command '{command}'")
-        show_help()
+    _storage().list_tasks()  # warm the cache before the first request
+    print(f"Task daemon listening on {path} (Ctrl+C to stop)", flush=True)
+    
+    # Requests are served on a worker thread. Python runs signal handlers
+    # on the main thread, so SIGTERM and Ctrl+C only ever land here and
+    # can't be mistaken for a command's own sys.exit() in _dispatch.
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        stop.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Let a running command finish, then exit without taking another;
+        # a reply still being read by a slow client is cut short
+        busy.acquire()
+        os.remove(path)
+
+
+def _require_arg(argv: list[str], message: str, usage: str) -> str:
+    """Return argv[2], or print an error and exit if it is missing."""
+    if len(argv) < 3:
+        print(f"Error: {message}")
+        print(f"Usage: python tasks.py {usage}")
         sys.exit(1)
+    return argv[2]
+
+
+def _is_task_id(arg: str) -> bool:
+    """Return True if arg is a plain decimal task ID."""
+    # isdigit() alone also accepts digits like "²" that int() rejects
+    return arg.isascii() and arg.isdigit()
+
+
+def _parse_task_id(argv: list[str], command: str) -> int:
+    """Return the task ID argument, or print an error and exit."""
+    arg = _require_arg(argv, "Task ID required.", f"{command} <task_id>")
+    if not _is_task_id(arg):
+        print("Error: Task ID must be a number.")
+        sys.exit(1)
+    return int(arg)
+
+
+def _parse_add(argv: list[str]) -> tuple:
+    """Return the (title, description) arguments, or exit with an error."""
+    title = _require_arg(argv, "Task title required.",
+                         "add <title> [description]")
+    description = argv[3] if len(argv) > 3 else ""
+    return title, description
+
+
+def _parse_keyword(argv: list[str]) -> str:
+    """Return the search keyword argument, or print an error and exit."""
+    return _require_arg(argv, "Search keyword required.", "search <keyword>")
+
+
+def _check_args(command: str, argv: list[str]) -> None:
+    """Print a usage error and exit if argv is invalid for command."""
+    if command == "add":
+        _parse_add(argv)
+    elif command == "search":
+        _parse_keyword(argv)
+    elif command in ("complete", "delete"):
+        _parse_task_id(argv, command)
+
+
+def _cmd_add(argv: list[str]) -> None:
+    """Handle 'add <title> [description]'."""
+    add_task(*_parse_add(argv))
+
+
+def _cmd_list(argv: list[str]) -> None:
+    """Handle 'list'."""
+    list_tasks()
+
+
+def _cmd_search(argv: list[str]) -> None:
+    """Handle 'search <keyword>'."""
+    search_tasks(_parse_keyword(argv))
+
+
+def _cmd_complete(argv: list[str]) -> None:
+    """Handle 'complete <task_id>'."""
+    complete_task(_parse_task_id(argv, "complete"))
+
+
+def _cmd_delete(argv: list[str]) -> None:
+    """Handle 'delete <task_id>'."""
+    delete_task(_parse_task_id(argv, "delete"))
+
+
+def _cmd_batch(argv: list[str]) -> None:
+    """Handle 'batch <file>'."""
+    batch_tasks(_require_arg(argv, "Batch file required.", "batch <file>"))
+
+
+def _cmd_batch_complete(argv: list[str]) -> None:
+    """Handle 'batch-complete <file>'."""
+    batch_complete(_require_arg(argv, "File of task IDs required.",
+                                "batch-complete <file>"))
+
+
+def _cmd_daemon(argv: list[str]) -> None:
+    """Handle 'daemon'."""
+    run_daemon()
+
+
+def _cmd_help(argv: list[str]) -> None:
+    """Handle 'help'."""
+    show_help()
+
+
+def _cmd_unknown(argv: list[str]) -> None:
+    """Report an unrecognised command."""
+    print(f"Error: Unknown command '{argv[1].lower()}'")
+    show_help()
+    sys.exit(1)
+
+
+# Command name -> handler; each handler validates its own arguments
+_COMMANDS = {
+    "add": _cmd_add,
+    "list": _cmd_list,
+    "search": _cmd_search,
+    "complete": _cmd_complete,
+    "delete": _cmd_delete,
+    "batch": _cmd_batch,
+    "batch-complete": _cmd_batch_complete,
+    "daemon": _cmd_daemon,
+    "help": _cmd_help,
+}
+
+
+def _command_name(argv: list[str]) -> str:
+    """Return the command word, lowercasing it only if it isn't a known one."""
+    command = argv[1]
+    if command not in _COMMANDS:
+        command = command.lower()
+    return command
+
+
+def main():
+    """Main entry point for the application."""
+    if len(sys.argv) < 2:
+        show_help()
+        return
+    
+    command = _command_name(sys.argv)
+    if command in _DAEMON_COMMANDS:
+        # Usage errors are reported here, without contacting the daemon
+        _check_args(command, sys.argv)
+        if _run_via_daemon(sys.argv):
+            return
+    
+    _COMMANDS.get(command, _cmd_unknown)(sys.argv)
 
 
 if __name__ == "__main__":